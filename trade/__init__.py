@@ -0,0 +1,3 @@
+"""
+세계 무역의존도 분석 대시보드 패키지
+"""
@@ -0,0 +1,260 @@
+"""
+무역의존도 대시보드의 데이터 로드/전처리 및 시각화 함수
+"""
+import os
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+# Plotly는 브라우저 폰트로 렌더링하므로 static/ 폴더의 나눔고딕을 @font-face로 등록해 사용
+# (정적 파일 제공이 꺼져 있으면 기본 sans-serif로 대체)
+FONT_FAMILY = "NanumGothic, 'Nanum Gothic', sans-serif"
+
+# -----------------------------------------------------------------------------
+# 1. 데이터 로드 및 전처리
+# -----------------------------------------------------------------------------
+def _cached_parquet_path(csv_path):
+    """
+    전처리 결과를 저장할 Parquet 캐시 파일 경로 (CSV 옆에 위치)
+    """
+    return csv_path + '.parquet'
+
+def _parse_csv(file_path):
+    """
+    국가별/연도별 2단 헤더 CSV를 (Country, Year, 수입, 수출, 수출대비_수입비율) 형태로 변환
+    """
+    # 2단 헤더(연도/수출·수입)만 먼저 읽고, 본문은 C 파서가 바로 float로 변환
+    header_df = pd.read_csv(file_path, nrows=2, header=None, dtype=str)
+    years = header_df.iloc[0, 1:].values  
+    types = header_df.iloc[1, 1:].values  
+    
+    data = pd.read_csv(
+        file_path, header=None, skiprows=2, index_col=0,
+        na_values=['-', '', 'N/A'],
+        dtype={0: 'string', **{i: 'float64' for i in range(1, len(years) + 1)}},
+    )
+    # 문자열 컬럼명("2022_수출")을 만들었다 다시 쪼개지 않고 (연도, 구분) MultiIndex로 바로 지정
+    data.columns = pd.MultiIndex.from_arrays([years, types], names=['Year', 'Type'])
+    
+    export = data.xs('수출', axis=1, level='Type')
+    imp = data.xs('수입', axis=1, level='Type')
+    if not export.columns.equals(imp.columns):
+        raise ValueError("CSV 헤더의 연도별 '수출, 수입' 구성이 일치하지 않습니다.")
+    
+    countries = data.index.str.strip().to_numpy()
+    unique_years = export.columns.to_numpy()
+    n_countries, n_years = len(countries), len(unique_years)
+    
+    export = export.to_numpy()
+    imp = imp.to_numpy()
+    
+    df_final = pd.DataFrame({
+        'Country': np.repeat(countries, n_years),
+        'Year': np.tile(unique_years, n_countries),
+        '수입': imp.ravel(),
+        '수출': export.ravel(),
+    })
+    # 수출/수입 값이 모두 없는 연도는 제외 (기존 pivot_table 동작과 동일)
+    df_final = df_final.dropna(subset=['수입', '수출'], how='all').reset_index(drop=True)
+    
+    # 수출이 0이거나 없으면 비율은 NaN (0으로 나눠 inf가 생기지 않도록)
+    exp = df_final['수출'].to_numpy()
+    imp = df_final['수입'].to_numpy()
+    df_final['수출대비_수입비율'] = np.divide(
+        imp, exp, out=np.full_like(exp, np.nan, dtype=np.float64), where=exp > 0
+    ) * 100
+    
+    # 국가는 범주형, 연도는 정수로 두어 필터/정렬을 코드 비교로 처리
+    df_final['Country'] = df_final['Country'].astype('category')
+    df_final['Year'] = df_final['Year'].astype('int16')
+    
+    return df_final
+
+def _load_frame(file_path):
+    # CSV와 코드보다 최신인 Parquet 캐시가 있으면 재파싱 없이 바로 사용
+    parquet_path = _cached_parquet_path(file_path)
+    try:
+        csv_mtime = os.stat(file_path).st_mtime
+    except FileNotFoundError:
+        return None
+    
+    try:
+        cache_mtime = os.stat(parquet_path).st_mtime
+        if cache_mtime > max(csv_mtime, os.stat(__file__).st_mtime):
+            return pd.read_parquet(parquet_path, engine='pyarrow')
+    except (OSError, ImportError, ValueError):
+        pass
+    
+    df_final = _parse_csv(file_path)
+    
+    # 캐시 저장 실패(읽기 전용 디렉터리, pyarrow 미설치 등)는 무시
+    try:
+        df_final.to_parquet(parquet_path, engine='pyarrow', compression='zstd')
+    except (OSError, ImportError):
+        pass
+    
+    return df_final
+
+def _diff_by_country(cc, yc, values, n_countries, base_year, target_year):
+    """
+    국가 코드(cc) 위치에 target_year - base_year 값을 기록 (없는 국가는 NaN)
+    """
+    base = np.full(n_countries, np.nan)
+    target = np.full(n_countries, np.nan)
+    m_base = yc == base_year
+    m_target = yc == target_year
+    base[cc[m_base]] = values[m_base]
+    target[cc[m_target]] = values[m_target]
+    return target - base
+
+def _build_change_frame(df, base_year=2022, target_year=2024):
+    """
+    국가별 base_year 대비 target_year 수출/수입 증감 (두 연도 모두 있는 국가만)
+    """
+    yc = df['Year'].to_numpy()
+    if not ((yc == base_year).any() and (yc == target_year).any()):
+        return None
+    
+    # pivot 없이 범주 코드를 인덱스로 삼아 한 번에 흩뿌려 계산
+    categories = df['Country'].cat.categories
+    cc = df['Country'].cat.codes.to_numpy()
+    export_diff = _diff_by_country(cc, yc, df['수출'].to_numpy(), len(categories), base_year, target_year)
+    import_diff = _diff_by_country(cc, yc, df['수입'].to_numpy(), len(categories), base_year, target_year)
+    
+    valid = np.flatnonzero(~np.isnan(export_diff) & ~np.isnan(import_diff))
+    return pd.DataFrame({
+        'Country': pd.Categorical.from_codes(valid, categories=categories),
+        '수출_증감': export_diff[valid],
+        '수입_증감': import_diff[valid],
+    })
+
+@st.cache_data
+def load_data(file_path, mtime):
+    """
+    (전체 데이터, 22년도 대비 24년도 증감 데이터)를 함께 반환. 파일이 없으면 (None, None)
+    mtime은 캐시 키 용도로만 사용 (CSV를 덮어쓰면 캐시가 자동으로 갱신됨)
+    """
+    df = _load_frame(file_path)
+    if df is None:
+        return None, None
+    return df, _build_change_frame(df)
+
+def topk(df, col, k=10, largest=True):
+    """
+    col 기준 상위(또는 하위) k개 행을 정렬된 순서로 반환. NaN은 제외
+    전체 정렬 대신 np.argpartition으로 k개만 골라낸 뒤 그 k개만 정렬
+    """
+    v = df[col].to_numpy()
+    valid = np.flatnonzero(~np.isnan(v))
+    k = min(k, valid.size)
+    if k == 0:
+        return df.iloc[[]]
+    
+    vv = v[valid]
+    idx = np.argpartition(vv, -k)[-k:] if largest else np.argpartition(vv, k - 1)[:k]
+    order = np.argsort(vv[idx], kind='stable')
+    if largest:
+        order = order[::-1]
+    return df.iloc[valid[idx[order]]]
+
+# 연도별 순위: (국가 코드, 값) 쌍의 구조화 배열
+RANKING_DTYPE = np.dtype([('country', np.int32), ('value', np.float64)])
+RANKING_COLUMNS = ['수출', '수입', '수출대비_수입비율']
+
+@st.cache_data
+def precomputed_topk(df, k=10):
+    """
+    (연도, 컬럼, 'top'/'bot') -> 정렬된 상위/하위 k개 순위 배열 (메뉴 1~4용)
+    """
+    out = {}
+    for y, g in df.groupby('Year', sort=False):
+        for col in RANKING_COLUMNS:
+            for key, largest in (('top', True), ('bot', False)):
+                rows = topk(g, col, k, largest=largest)
+                ranking = np.empty(len(rows), dtype=RANKING_DTYPE)
+                ranking['country'] = rows['Country'].cat.codes.to_numpy()
+                ranking['value'] = rows[col].to_numpy()
+                out[(int(y), col, key)] = ranking
+    return out
+
+def yearly_ranking(df, year, col, largest=True):
+    """
+    미리 계산된 순위 배열을 (Country, col) DataFrame으로 변환
+    """
+    ranking = precomputed_topk(df)[(year, col, 'top' if largest else 'bot')]
+    return pd.DataFrame({
+        'Country': df['Country'].cat.categories[ranking['country']],
+        col: ranking['value'],
+    })
+
+@st.cache_data
+def by_country(df):
+    """
+    국가 -> 연도순으로 정렬된 해당 국가 데이터 딕셔너리 (메뉴 9 국가 전환용)
+    """
+    return {
+        str(c): g.sort_values('Year').reset_index(drop=True)
+        for c, g in df.groupby('Country', sort=False, observed=True)
+    }
+
+# -----------------------------------------------------------------------------
+# 2. 시각화 함수
+# -----------------------------------------------------------------------------
+@st.cache_data
+def _build_bar_figure(data_tuple, x_col, y_col, title, ylabel):
+    """
+    (x, y) 튜플로 막대 그래프 Figure 생성 (같은 입력이면 캐시 재사용)
+    """
+    data = pd.DataFrame(data_tuple, columns=[x_col, y_col])
+    
+    # 막대 그래프 (값 표시 포함)
+    # 절대값 그래프라도 원래 값이 음수였다면 '-'를 붙여줄 수도 있지만,
+    # 현재 로직은 절대값 변환된 데이터 자체를 그리므로 그냥 양수로 표현합니다.
+    fig = px.bar(data, x=x_col, y=y_col, text_auto='.1f')
+    colors = px.colors.sample_colorscale('Viridis', np.linspace(0, 0.9, len(data)).tolist())
+    fig.update_traces(marker_color=colors, textposition='outside', cliponaxis=False)
+    
+    fig.update_layout(
+        title=dict(text=f"<b>{title}</b>", x=0.5, xanchor='center', font_size=18),
+        xaxis_title="국가",
+        yaxis_title=ylabel if ylabel else y_col,
+        xaxis_tickangle=-45,
+        template='plotly_white',
+        font_family=FONT_FAMILY,
+        height=500,
+    )
+    return fig
+
+@st.cache_data
+def _build_line_figure(data_tuple, x_col, y_cols, title):
+    """
+    (x, y1, y2, ...) 튜플로 선 그래프 Figure 생성
+    """
+    data = pd.DataFrame(data_tuple, columns=[x_col, *y_cols])
+    
+    fig = px.line(data, x=x_col, y=list(y_cols), markers=True)
+    
+    fig.update_layout(
+        title=dict(text=f"<b>{title}</b>", x=0.5, xanchor='center', font_size=18),
+        xaxis=dict(title=x_col, tickmode='array', tickvals=data[x_col].tolist()),
+        yaxis_title="비중 (%)",
+        legend_title_text=None,
+        template='plotly_white',
+        font_family=FONT_FAMILY,
+        height=500,
+    )
+    return fig
+
+def plot_bar_chart(data, x_col, y_col, title, ylabel=None):
+    # [수정] 막대가 길수록 오른쪽으로 가도록 오름차순 정렬 (작은 값 -> 큰 값)
+    data = data.sort_values(by=y_col, ascending=True)
+    
+    data_tuple = tuple(zip(data[x_col].tolist(), data[y_col].tolist()))
+    st.plotly_chart(_build_bar_figure(data_tuple, x_col, y_col, title, ylabel), use_container_width=True)
+
+def plot_line_chart(data, x_col, y_cols, title):
+    y_cols = tuple(y_cols)
+    data_tuple = tuple(zip(*(data[c].tolist() for c in (x_col, *y_cols))))
+    st.plotly_chart(_build_line_figure(data_tuple, x_col, y_cols, title), use_container_width=True)